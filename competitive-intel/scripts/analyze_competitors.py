@@ -20,32 +20,29 @@ import time
 import argparse
 from datetime import datetime
 
-try:
-    import requests
-except ImportError:
-    print("❌ Error: 'requests' library not found")
-    print("Install with: pip install requests")
-    sys.exit(1)
+from apify_http import ApifyClient, ApifyError
 
+# Give up polling after this many failed status checks in a row, or this long overall
+MAX_POLL_FAILURES = 10
+MAX_WAIT_SECONDS = 30 * 60
 
-def analyze_competitors(domains, apify_token=None):
+
+def analyze_competitors(domains, apify_token=None, client=None):
     """
     Scrape SimilarWeb data for multiple competitors
     
     Args:
         domains (list): List of domain names (without https://)
         apify_token (str): Apify API token (optional, will use env var if not provided)
+        client (ApifyClient): shared client (optional, created from the token if not provided)
     
     Returns:
         dict: Structured competitor data
     """
     
-    # Get token from env if not provided
-    if not apify_token:
-        apify_token = os.getenv('APIFY_API_TOKEN')
-    
-    if not apify_token:
-        raise ValueError("APIFY_API_TOKEN not set. Export it or pass via --token")
+    # Pooled, rate-limited client (token falls back to APIFY_API_TOKEN)
+    if client is None:
+        client = ApifyClient(apify_token)
     
     # Apify SimilarWeb scraper (free tier)
     ACTOR_ID = "mscraper~similarweb-quick-scraper"
@@ -62,12 +59,7 @@ def analyze_competitors(domains, apify_token=None):
     print()
     
     # Start scraper run
-    run_url = f"https://api.apify.com/v2/acts/{ACTOR_ID}/runs"
-    response = requests.post(
-        run_url,
-        params={"token": apify_token},
-        json=input_data
-    )
+    response = client.post(f"acts/{ACTOR_ID}/runs", json=input_data)
     
     if response.status_code != 201:
         print(f"❌ Error starting scraper: {response.status_code}")
@@ -82,19 +74,45 @@ def analyze_competitors(domains, apify_token=None):
     print(f"📊 Dataset ID: {dataset_id}")
     print(f"\n⏳ Waiting for results (30-60 seconds)...\n")
     
-    # Poll for completion
+    def give_up(reason):
+        print(f"\n❌ {reason}")
+        print(f"   Run ID: {run_id}")
+        print(f"   Dataset ID: {dataset_id} (fetch it later once the run finishes)")
+        sys.exit(1)
+    
+    # Poll for completion (the API holds each request up to 60s until the run finishes)
+    failures = 0
+    deadline = time.monotonic() + MAX_WAIT_SECONDS
     while True:
-        status_url = f"https://api.apify.com/v2/acts/{ACTOR_ID}/runs/{run_id}"
-        status_resp = requests.get(status_url, params={"token": apify_token})
+        if time.monotonic() > deadline:
+            give_up(f"Run still not finished after {MAX_WAIT_SECONDS // 60} minutes")
         
-        if status_resp.status_code == 200:
-            status = status_resp.json()['data']['status']
-            print(f"   Status: {status}...", end='\r')
+        try:
+            status_resp = client.get(f"acts/{ACTOR_ID}/runs/{run_id}", params={"waitForFinish": 60},
+                                     timeout=(5, 90))
+        except ApifyError as e:
+            failures += 1
+            problem = str(e)
+        else:
+            if status_resp.status_code == 200:
+                failures = 0
+                status = status_resp.json()['data']['status']
+                print(f"   Status: {status}...", end='\r')
+                
+                if status in ['SUCCEEDED', 'FAILED', 'ABORTED', 'TIMED-OUT']:
+                    print(f"\n   Final Status: {status}")
+                    break
+                continue
             
-            if status in ['SUCCEEDED', 'FAILED', 'ABORTED', 'TIMED-OUT']:
-                print(f"\n   Final Status: {status}")
-                break
+            # Client errors (bad token, missing run) won't fix themselves
+            if 400 <= status_resp.status_code < 500 and status_resp.status_code != 429:
+                give_up(f"Status check returned {status_resp.status_code}: {status_resp.text[:200]}")
+            failures += 1
+            problem = f"Status check returned {status_resp.status_code}"
         
+        if failures >= MAX_POLL_FAILURES:
+            give_up(f"{problem} ({failures} failed status checks in a row)")
+        print(f"\n   ⚠️  {problem}; retrying ({failures}/{MAX_POLL_FAILURES})")
         time.sleep(5)
     
     if status != 'SUCCEEDED':
@@ -103,15 +121,17 @@ def analyze_competitors(domains, apify_token=None):
     
     # Retrieve results
     print(f"\n📥 Retrieving data...")
-    results_url = f"https://api.apify.com/v2/datasets/{dataset_id}/items"
-    results_resp = requests.get(results_url, params={"token": apify_token})
+    try:
+        results_resp = client.get(f"datasets/{dataset_id}/items")
+    except ApifyError as e:
+        give_up(f"Error fetching results: {e}")
     
     if results_resp.status_code != 200:
-        print(f"❌ Error fetching results: {results_resp.status_code}")
-        sys.exit(1)
+        give_up(f"Error fetching results: {results_resp.status_code}")
     
     results = results_resp.json()
-    print(f"✅ Retrieved {len(results)} results!\n")
+    print(f"✅ Retrieved {len(results)} results!")
+    print(f"   HTTP: {client.stats['requests']} requests, {client.stats['retries']} retries\n")
     
     # Structure data
     structured_data = {
@@ -159,7 +179,7 @@ def analyze_competitors(domains, apify_token=None):
     return structured_data
 
 
-def main():
+def build_parser():
     parser = argparse.ArgumentParser(
         description="Analyze competitors using SimilarWeb data via Apify API",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -189,15 +209,17 @@ Examples:
         required=True,
         help='Output JSON file path (e.g., results/analysis_20251231.json)'
     )
-    
-    args = parser.parse_args()
-    
+    return parser
+
+
+def run(args, client=None):
+    """Analyze, save and summarize; returns the structured data"""
     # Parse domains
     domains = [d.strip() for d in args.domains.split(',')]
     
     # Analyze competitors
     try:
-        data = analyze_competitors(domains, args.token)
+        data = analyze_competitors(domains, args.token, client)
     except Exception as e:
         print(f"\n❌ Error: {e}")
         sys.exit(1)
@@ -234,6 +256,12 @@ Examples:
     print(f"\n{'='*80}")
     print(f"✅ Analysis complete! Use generate_summary.py to create exec summary.")
     print("="*80)
+    
+    return data
+
+
+def main():
+    run(build_parser().parse_args())
 
 
 if __name__ == "__main__":
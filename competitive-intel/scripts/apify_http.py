@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Pooled, rate-limited HTTP client for the Apify API
+
+One keep-alive requests.Session per client, per-request timeouts, a token
+bucket matched to Apify's per-resource limit, and jittered exponential
+backoff for transient failures (429, 5xx, connection errors).
+
+Only idempotent GETs are retried on 5xx/connection errors. POSTs (which
+start paid runs) are retried only on 429, where Apify rejected the request
+before doing any work.
+
+Usage:
+    from apify_http import ApifyClient
+
+    client = ApifyClient(token)
+    run = client.post(f"acts/{actor_id}/runs", json={"websites": domains})
+    print(client.stats)
+"""
+
+import os
+import time
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_BASE = "https://api.apify.com/v2/"
+
+# Apify allows 30 requests/second per resource and 250/second per user;
+# stay a little under the per-resource limit by default.
+DEFAULT_RATE = 25
+DEFAULT_BURST = 25
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5  # seconds, doubled per attempt
+MAX_BACKOFF = 30
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ApifyError(Exception):
+    """Raised when an Apify request cannot be completed after all retries"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/second, up to `burst` stored"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available; return seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ApifyClient:
+    """
+    Shared HTTP client for Apify API calls
+
+    Args:
+        token (str): Apify API token (falls back to APIFY_API_TOKEN)
+        rate (float): sustained requests per second
+        burst (int): maximum burst size
+        timeout (tuple): (connect, read) timeout in seconds
+        max_retries (int): retries per request for transient failures
+        pool_size (int): keep-alive connections kept in the pool
+    """
+
+    def __init__(self, token=None, rate=DEFAULT_RATE, burst=DEFAULT_BURST, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, pool_size=10):
+        token = token or os.getenv('APIFY_API_TOKEN')
+        if not token:
+            raise ValueError("APIFY_API_TOKEN not set. Export it or pass via --token")
+
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = TokenBucket(rate, burst)
+
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {token}"})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "throttled_seconds": 0.0, "failures": 0}
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _backoff(self, attempt, response=None):
+        """Full-jitter exponential backoff, honouring Retry-After when present"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), MAX_BACKOFF)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(MAX_BACKOFF, DEFAULT_BACKOFF * (2 ** attempt)))
+
+    def request(self, method, path, idempotent=None, **kwargs):
+        """
+        Send a request, retrying transient failures
+
+        Args:
+            method (str): HTTP method
+            path (str): path relative to the API base, or a full URL
+            idempotent (bool): retry on 5xx/connection errors (defaults to True for GET)
+
+        Returns:
+            requests.Response: final response (any status) once retries are exhausted
+
+        Raises:
+            ApifyError: connection errors persisted through all retries
+        """
+        if idempotent is None:
+            idempotent = method.upper() == "GET"
+        url = path if path.startswith("http") else API_BASE + path.lstrip("/")
+        kwargs.setdefault("timeout", self.timeout)
+
+        attempt = 0
+        while True:
+            waited = self.limiter.acquire()
+            if waited:
+                self._count("throttled_seconds", waited)
+            self._count("requests")
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not idempotent or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise ApifyError(f"{method} {path} failed: {e}") from e
+                response = None
+            else:
+                retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUSES)
+                if not retryable or attempt >= self.max_retries:
+                    if response.status_code >= 400:
+                        self._count("failures")
+                    return response
+
+            self._count("retries")
+            time.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
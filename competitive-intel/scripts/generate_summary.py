@@ -12,6 +12,7 @@ Usage:
         --output results/EXEC_SUMMARY_20251231.md
 """
 
+import sys
 import json
 import argparse
 from datetime import datetime
@@ -303,7 +304,7 @@ You've successfully bypassed SimilarWeb paywall and analyzed {len(competitors)}
     return md
 
 
-def main():
+def build_parser():
     parser = argparse.ArgumentParser(
         description="Generate executive summary from competitor analysis",
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -314,20 +315,28 @@ def main():
     parser.add_argument('--product-focus', required=True, help='Your product focus/niche (e.g., "Foreclosure auction intelligence")')
     parser.add_argument('--target-users', type=int, required=True, help='Target user count for Year 5 (e.g., 5000)')
     parser.add_argument('--target-arpu', type=int, required=True, help='Target ARPU in dollars per month (e.g., 297)')
-    
-    args = parser.parse_args()
-    
-    # Load data
+    return parser
+
+
+def load_input(path):
+    """Load an analyze_competitors.py JSON file, exiting with a message on failure"""
     try:
-        with open(args.input, 'r') as f:
-            data = json.load(f)
+        with open(path, 'r') as f:
+            return json.load(f)
     except FileNotFoundError:
-        print(f"❌ Error: Input file not found: {args.input}")
+        print(f"❌ Error: Input file not found: {path}")
         print(f"Run analyze_competitors.py first to generate the data file.")
         sys.exit(1)
     except json.JSONDecodeError:
-        print(f"❌ Error: Invalid JSON in {args.input}")
+        print(f"❌ Error: Invalid JSON in {path}")
         sys.exit(1)
+
+
+def run(args, data=None):
+    """Generate and save the summary; `data` skips re-reading args.input"""
+    # Load data
+    if data is None:
+        data = load_input(args.input)
     
     # Generate summary
     summary = generate_summary(
@@ -350,6 +359,12 @@ def main():
     print(f"   - Target ARPU: ${args.target_arpu}/mo")
     print(f"   - Target ARR (Y5): ${args.target_users * args.target_arpu * 12:,}")
     print(f"\n🚀 Next: Review {args.output} and proceed with validation interviews!")
+    
+    return summary
+
+
+def main():
+    run(build_parser().parse_args())
 
 
 if __name__ == "__main__":
@@ -84,6 +84,10 @@ CREATE INDEX idx_cta_clicks_tool ON cta_clicks(tool);
 CREATE INDEX idx_interviews_tool ON interviews(tool);
 CREATE INDEX idx_validation_scores_tool ON validation_scores(tool);
 
+-- Keyset pagination for the session funnel (funnel_analysis.py)
+CREATE INDEX idx_visitors_tool_session ON visitors(tool, session_id, id);
+CREATE INDEX idx_cta_clicks_tool_session ON cta_clicks(tool, session_id, id);
+
 -- Create view for dashboard
 CREATE OR REPLACE VIEW validation_dashboard AS
 SELECT 
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Run many tracker / competitive-intel operations in one warm process
+
+Reads a batch script with one operation per line. Each line takes the same
+flags as the standalone script it replaces:
+
+    add        validation-tracker/add_interview.py
+    score      validation-tracker/calculate_score.py
+    scrape     competitive-intel/scripts/analyze_competitors.py
+    summarize  competitive-intel/scripts/generate_summary.py
+    load       pre-parse an analysis JSON file (--input) for later summaries
+
+All steps share one Supabase client, one pooled Apify client per token, the parsed
+analysis files and the attribution caches. Steps that don't touch the same
+tool or file run concurrently; a step waits for earlier steps that write
+what it reads (e.g. `score` after `add` for the same tool, `summarize`
+after the `scrape` that produces its input).
+
+Example script (nightly.batch):
+    # interviews logged today
+    add --tool "Zoning Analyst" --contact "Jane Doe, Acme HOA" --pain_score 8 --would_pay Yes --amount 297
+    scrape --domains "dealcheck.io,zilculator.com" --output competitive-intel/results/nightly.json
+    summarize --input competitive-intel/results/nightly.json --output competitive-intel/results/NIGHTLY.md \\
+        --product-name "BidDeed.AI" --product-focus "Foreclosure auction intelligence" \\
+        --target-users 5000 --target-arpu 297
+    score --tool "Zoning Analyst" --exclude-bots
+    score --tool "Lien Discovery"
+
+Usage:
+    python3 run_batch.py nightly.batch
+    python3 run_batch.py nightly.batch --workers 8
+    python3 run_batch.py nightly.batch --dry-run
+"""
+import os
+import io
+import sys
+import time
+import shlex
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "validation-tracker"))
+sys.path.insert(0, os.path.join(ROOT, "competitive-intel", "scripts"))
+
+OPERATIONS = ["add", "score", "scrape", "summarize", "load"]
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that buffers each worker thread's output separately"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def begin(self):
+        self.local.buffer = io.StringIO()
+
+    def end(self):
+        buffer = self.local.buffer
+        self.local.buffer = None
+        return buffer.getvalue()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _load_lines(path):
+    """Read script lines, joining backslash continuations; yields (line_no, text)"""
+    handle = sys.stdin if path == "-" else open(path)
+    pending, start = "", None
+    with handle:
+        for number, line in enumerate(handle, 1):
+            line = line.rstrip("\n")
+            if start is None:
+                start = number
+            else:
+                line = line.lstrip()
+            if line.endswith("\\"):
+                pending += line[:-1].rstrip() + " "
+                continue
+            text = (pending + line).strip()
+            pending, first, start = "", start, None
+            if text and not text.startswith("#"):
+                yield first, text
+        if start is not None:
+            raise ValueError(f"line {start}: script ends inside a '\\' line continuation")
+
+
+def _parser_for(op):
+    if op == "add":
+        from add_interview import build_parser
+    elif op == "score":
+        from calculate_score import build_parser
+    elif op == "scrape":
+        from analyze_competitors import build_parser
+    elif op == "summarize":
+        from generate_summary import build_parser
+    else:
+        parser = argparse.ArgumentParser(description="Pre-parse an analysis JSON file")
+        parser.add_argument("--input", required=True, help="analyze_competitors.py output file")
+        return parser
+    parser = build_parser()
+    parser.prog = op
+    return parser
+
+
+def parse_script(path):
+    """
+    Parse a batch script into steps
+
+    Returns:
+        list: dicts with op, args, line, reads, writes, deps (earlier steps to wait
+            for) and needs (the subset whose output this step reads)
+
+    Raises:
+        ValueError: unknown operation or invalid flags (with the line number)
+    """
+    parsers = {}
+    steps = []
+    for line, text in _load_lines(path):
+        try:
+            op, *argv = shlex.split(text)
+        except ValueError as e:
+            raise ValueError(f"line {line}: {e}")
+        if op not in OPERATIONS:
+            raise ValueError(f"line {line}: unknown operation '{op}' (expected one of {', '.join(OPERATIONS)})")
+        if op not in parsers:
+            parsers[op] = _parser_for(op)
+        try:
+            args = parsers[op].parse_args(argv)
+        except SystemExit:
+            raise ValueError(f"line {line}: invalid arguments for '{op}'")
+
+        reads, writes = set(), set()
+        if op == "add":
+            writes.add(("tool", args.tool))
+        elif op == "score":
+            reads.add(("tool", args.tool))
+        elif op == "scrape":
+            writes.add(("file", os.path.abspath(args.output)))
+        elif op == "load":
+            writes.add(("file", os.path.abspath(args.input)))
+        elif op == "summarize":
+            reads.add(("file", os.path.abspath(args.input)))
+            writes.add(("file", os.path.abspath(args.output)))
+
+        # Depend on earlier steps we'd race with: read-after-write, write-after-read/write
+        deps = [
+            i for i, prev in enumerate(steps)
+            if prev["writes"] & (reads | writes) or prev["reads"] & writes
+        ]
+        needs = [i for i in deps if steps[i]["writes"] & reads]
+        steps.append({"op": op, "args": args, "line": line, "text": text,
+                      "reads": reads, "writes": writes, "deps": deps, "needs": needs})
+    return steps
+
+
+class BatchRunner:
+    """Executes parsed steps with shared clients and caches"""
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.inputs = {}  # abspath -> parsed analysis JSON
+        self._supabase = None
+        self._apify = {}  # token (None = APIFY_API_TOKEN) -> ApifyClient
+
+    def supabase(self):
+        with self.lock:
+            if self._supabase is None:
+                url = os.getenv("SUPABASE_URL")
+                key = os.getenv("SUPABASE_KEY")
+                if not url or not key:
+                    raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in .env")
+                from supabase import create_client
+                self._supabase = create_client(url, key)
+            return self._supabase
+
+    def apify(self, token=None):
+        with self.lock:
+            if token not in self._apify:
+                from apify_http import ApifyClient
+                self._apify[token] = ApifyClient(token)
+            return self._apify[token]
+
+    def _input(self, path):
+        key = os.path.abspath(path)
+        with self.lock:
+            data = self.inputs.get(key)
+        if data is None:
+            from generate_summary import load_input
+            data = load_input(path)
+            with self.lock:
+                self.inputs[key] = data
+        return data
+
+    def run_step(self, step):
+        """Run one step; returns True on success"""
+        op, args = step["op"], step["args"]
+        if op == "add":
+            from add_interview import add_interview
+            return add_interview(args, supabase=self.supabase()) is not False
+        if op == "score":
+            from calculate_score import calculate_score
+            calculate_score(args.tool, args.session_conversion, args.exclude_bots, supabase=self.supabase())
+            return True
+        if op == "scrape":
+            from analyze_competitors import run
+            data = run(args, client=self.apify(args.token))
+            with self.lock:
+                self.inputs[os.path.abspath(args.output)] = data
+            return True
+        if op == "summarize":
+            from generate_summary import run
+            run(args, data=self._input(args.input))
+            return True
+        if op == "load":
+            data = self._input(args.input)
+            print(f"📂 Loaded {args.input} ({len(data.get('competitors', []))} competitors)")
+            return True
+        raise ValueError(f"unknown operation '{op}'")
+
+    def _execute(self, step, output):
+        output.begin()
+        started = time.perf_counter()
+        try:
+            ok = self.run_step(step)
+        except SystemExit:
+            ok = False
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            ok = False
+        return ok, time.perf_counter() - started, output.end()
+
+    def run(self, steps):
+        """Run all steps, respecting dependencies; returns a status per step"""
+        status = [None] * len(steps)  # None pending, "running", "ok", "failed", "skipped"
+        output = _ThreadOutput(sys.stdout)
+        real_stdout, sys.stdout = sys.stdout, output
+        started = time.perf_counter()
+
+        def report(i, state, elapsed=None, text=""):
+            step = steps[i]
+            timing = f" in {elapsed:.1f}s" if elapsed is not None else ""
+            icon = {"ok": "✅", "failed": "❌", "skipped": "⏭️ "}[state]
+            real_stdout.write(f"\n{icon} [{i + 1}/{len(steps)}] line {step['line']}: {step['op']} {state}{timing}\n")
+            if text:
+                real_stdout.write(text if text.endswith("\n") else text + "\n")
+            real_stdout.flush()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                running = {}
+                while True:
+                    for i, step in enumerate(steps):
+                        if status[i] is not None:
+                            continue
+                        if any(status[d] in ("failed", "skipped") for d in step["needs"]):
+                            status[i] = "skipped"
+                            report(i, "skipped", text="   (an earlier step it reads from did not succeed)")
+                        elif all(status[d] in ("ok", "failed", "skipped") for d in step["deps"]):
+                            status[i] = "running"
+                            running[pool.submit(self._execute, step, output)] = i
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        i = running.pop(future)
+                        ok, elapsed, text = future.result()
+                        status[i] = "ok" if ok else "failed"
+                        report(i, status[i], elapsed, text)
+        finally:
+            sys.stdout = real_stdout
+
+        counts = {s: status.count(s) for s in ("ok", "failed", "skipped")}
+        print("\n" + "=" * 60)
+        print(f"BATCH COMPLETE in {time.perf_counter() - started:.1f}s: "
+              f"{counts['ok']} ok, {counts['failed']} failed, {counts['skipped']} skipped")
+        if self._apify:
+            requests = sum(client.stats["requests"] for client in self._apify.values())
+            retries = sum(client.stats["retries"] for client in self._apify.values())
+            print(f"  Apify HTTP: {requests} requests, {retries} retries")
+        print("=" * 60)
+        return status
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a batch of tracker / competitive-intel operations in one process",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"Operations: {', '.join(OPERATIONS)}. See the module docstring for the script format."
+    )
+    parser.add_argument('script', help='Batch script path ("-" for stdin)')
+    parser.add_argument('--workers', type=int, default=4, help='Maximum steps running at once (default: 4)')
+    parser.add_argument('--dry-run', action='store_true', help='Parse the script and print the plan only')
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    try:
+        steps = parse_script(args.script)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.dry_run:
+        print(f"📋 {len(steps)} steps:")
+        for i, step in enumerate(steps):
+            after = f" (after {', '.join(str(d + 1) for d in step['deps'])})" if step["deps"] else ""
+            print(f"  {i + 1}. line {step['line']}: {step['text']}{after}")
+        return
+
+    status = BatchRunner(args.workers).run(steps)
+    if any(s != "ok" for s in status):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,16 +8,17 @@ import argparse
 from datetime import date
 from supabase import create_client, Client
 
-def add_interview(args):
-    # Initialize Supabase
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
-    
-    if not url or not key:
-        print("❌ Error: SUPABASE_URL and SUPABASE_KEY must be set in .env")
-        return False
-    
-    supabase: Client = create_client(url, key)
+def add_interview(args, supabase=None):
+    # Initialize Supabase (unless a shared client is passed in)
+    if supabase is None:
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+        
+        if not url or not key:
+            print("❌ Error: SUPABASE_URL and SUPABASE_KEY must be set in .env")
+            return False
+        
+        supabase: Client = create_client(url, key)
     
     # Prepare interview data
     interview_data = {
@@ -44,7 +45,7 @@ def add_interview(args):
         print(f"❌ Error adding interview: {e}")
         return False
 
-if __name__ == "__main__":
+def build_parser():
     parser = argparse.ArgumentParser(description="Add interview to validation tracker")
     parser.add_argument("--tool", required=True, choices=["Zoning Analyst", "Lien Discovery"])
     parser.add_argument("--contact", required=True, help="Contact name and company")
@@ -54,6 +55,8 @@ if __name__ == "__main__":
     parser.add_argument("--urgency", default="Medium", choices=["High", "Medium", "Low"])
     parser.add_argument("--date", help="Interview date (YYYY-MM-DD)")
     parser.add_argument("--notes", default="")
-    
-    args = parser.parse_args()
+    return parser
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
     add_interview(args)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Traffic attribution for landing page visitors
+
+Classifies visitors.referrer into a traffic source and visitors.user_agent
+into a device class, flagging bots and crawlers. Raw strings repeat heavily
+(same few referrers, same browser builds), so both classifiers are memoized
+in a bounded LRU cache and a full table scan costs little more than the scan.
+
+Sources:
+    direct, search, social, email, or "referral:<domain>" for anything else
+Devices:
+    desktop, mobile, tablet, bot, unknown
+
+Usage:
+    python3 attribution.py --tool "Zoning Analyst"
+    python3 attribution.py --tool "Lien Discovery" --cache-stats
+"""
+import os
+import sys
+import re
+import argparse
+from functools import lru_cache
+from urllib.parse import urlparse
+
+CACHE_SIZE = 4096
+
+# Matched against the whole host only: docs.google.com or sports.yahoo.com aren't search
+SEARCH_HOSTS = {
+    "duckduckgo.com", "search.yahoo.com", "baidu.com", "ecosia.org", "search.brave.com",
+    "startpage.com", "ask.com", "yandex.ru",
+}
+# Country variants of the big engines: google.com, google.co.uk, google.com.au, bing.com, yandex.com.tr
+SEARCH_HOST_PATTERN = re.compile(r"^(google|bing|yandex)\.(com?\.)?[a-z]{2,3}$")
+
+# Matched against the host or any parent domain (m.facebook.com -> facebook.com)
+SOCIAL_DOMAINS = {
+    "facebook.com", "fb.com", "instagram.com", "t.co", "twitter.com", "x.com",
+    "linkedin.com", "lnkd.in", "reddit.com", "youtube.com", "tiktok.com",
+    "pinterest.com", "threads.net", "news.ycombinator.com",
+}
+EMAIL_DOMAINS = {
+    "mail.google.com", "outlook.live.com", "outlook.office.com", "outlook.office365.com",
+    "mail.yahoo.com", "mail.aol.com", "mail.proton.me", "app.fastmail.com",
+    "com.google.android.gm",  # Gmail app (android-app://com.google.android.gm/)
+}
+
+# "bot" only as a crawler name (Googlebot/2.1, Slackbot-LinkExpanding), not inside model names like CUBOT
+BOT_PATTERN = re.compile(
+    r"bot(?:[/;)_.-]|$)|crawl|spider|slurp|scrape|headless|phantomjs|lighthouse|pingdom|uptime|statuscake|site24x7|"
+    r"facebookexternalhit|bingpreview|skypeuripreview|curl/|wget/|python-requests|python-urllib|httpclient|okhttp|go-http-client|axios/",
+    re.IGNORECASE,
+)
+TABLET_PATTERN = re.compile(r"ipad|tablet|kindle|silk/|playbook|android(?!.*mobile)", re.IGNORECASE)
+MOBILE_PATTERN = re.compile(r"mobi|iphone|ipod|android|blackberry|opera mini|iemobile", re.IGNORECASE)
+
+
+def _parent_domains(host):
+    """Yield host and each parent domain: a.b.com, b.com, com"""
+    parts = host.split(".")
+    for i in range(len(parts)):
+        yield ".".join(parts[i:])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def referrer_host(referrer):
+    """Normalize a raw referrer URL to its host (lowercase, no credentials, www. or port); '' when empty"""
+    if not referrer:
+        return ""
+    host = urlparse(referrer if "//" in referrer else "//" + referrer).hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def classify_referrer(referrer):
+    """Map a raw referrer URL to a traffic source"""
+    host = referrer_host(referrer)
+    if not host:
+        return "direct"
+
+    domains = list(_parent_domains(host))
+    if any(d in EMAIL_DOMAINS for d in domains) or host.startswith(("mail.", "webmail.")):
+        return "email"
+    if any(d in SOCIAL_DOMAINS for d in domains):
+        return "social"
+    if host in SEARCH_HOSTS or SEARCH_HOST_PATTERN.match(host):
+        return "search"
+    return f"referral:{host}"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def classify_user_agent(user_agent):
+    """Map a raw user agent to a device class ('bot' for crawlers and scripts)"""
+    if not user_agent:
+        return "unknown"
+    if BOT_PATTERN.search(user_agent):
+        return "bot"
+    if TABLET_PATTERN.search(user_agent):
+        return "tablet"
+    if MOBILE_PATTERN.search(user_agent):
+        return "mobile"
+    return "desktop"
+
+
+def attribute_visitors(visitors):
+    """
+    Aggregate visitor rows by traffic source and device class
+
+    Args:
+        visitors (iterable): visitor rows with 'referrer' and 'user_agent'
+
+    Returns:
+        dict: totals, bot-excluded count and per-source / per-device breakdowns
+    """
+    total = 0
+    bots = 0
+    sources = {}
+    devices = {}
+
+    for row in visitors:
+        total += 1
+        device = classify_user_agent(row.get("user_agent"))
+        devices[device] = devices.get(device, 0) + 1
+
+        source = sources.setdefault(classify_referrer(row.get("referrer")), {"visitors": 0, "human": 0})
+        source["visitors"] += 1
+        if device == "bot":
+            bots += 1
+        else:
+            source["human"] += 1
+
+    return {
+        "visitors": total,
+        "bots": bots,
+        "human_visitors": total - bots,
+        "sources": sources,
+        "devices": devices,
+    }
+
+
+def cache_stats():
+    """Return LRU hit/miss counters for the memoized classifiers"""
+    return {
+        "referrer": classify_referrer.cache_info()._asdict(),
+        "referrer_host": referrer_host.cache_info()._asdict(),
+        "user_agent": classify_user_agent.cache_info()._asdict(),
+    }
+
+
+def print_cache_stats():
+    print(f"\nLRU CACHE:")
+    for name, info in cache_stats().items():
+        lookups = info["hits"] + info["misses"]
+        rate = (info["hits"] / lookups * 100) if lookups else 0
+        print(f"  {name}: {info['hits']}/{lookups} hits ({rate:.1f}%), {info['currsize']} cached")
+
+
+def print_attribution(tool_name, attribution):
+    print("=" * 60)
+    print(f"TRAFFIC ATTRIBUTION: {tool_name}")
+    print("=" * 60)
+    print(f"\nVISITORS:")
+    print(f"  Total: {attribution['visitors']}")
+    print(f"  Bots excluded: {attribution['bots']}")
+    print(f"  Human visitors: {attribution['human_visitors']}")
+
+    print(f"\nBY SOURCE:")
+    for source, counts in sorted(attribution["sources"].items(), key=lambda x: x[1]["human"], reverse=True):
+        print(f"  {source}: {counts['human']} human / {counts['visitors']} total")
+
+    print(f"\nBY DEVICE:")
+    for device, count in sorted(attribution["devices"].items(), key=lambda x: x[1], reverse=True):
+        print(f"  {device}: {count}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Attribute landing page traffic by source and device")
+    parser.add_argument("--tool", required=True, choices=["Zoning Analyst", "Lien Discovery"])
+    parser.add_argument("--cache-stats", action="store_true", help="Print classifier LRU cache hit rates")
+    args = parser.parse_args()
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+
+    if not url or not key:
+        print("❌ Error: Set SUPABASE_URL and SUPABASE_KEY in .env")
+        sys.exit(1)
+
+    from supabase import create_client
+    from funnel_analysis import stream_rows
+
+    supabase = create_client(url, key)
+    visitors = stream_rows(supabase, "visitors", args.tool, "referrer,user_agent")
+    print_attribution(args.tool, attribute_visitors(visitors))
+    if args.cache_stats:
+        print_cache_stats()
@@ -6,53 +6,126 @@ import os
 import sys
 import argparse
 from supabase import create_client, Client
+from funnel_analysis import run_funnel, stream_rows, count_rows
+from attribution import attribute_visitors
 
-def calculate_score(tool_name):
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
+GREEN_THRESHOLD = 60
+YELLOW_THRESHOLD = 40
+
+def compute_score(visitor_count, cta_conversion, interview_count, would_pay_pct, high_urgency, xp=None):
+    """
+    Validation scoring formula
+    
+    Works on plain numbers, or on NumPy arrays when `xp` is the numpy module
+    (used by simulate.py to evaluate many scenarios at once).
+    """
+    minimum = xp.minimum if xp is not None else min
+    truncate = xp.floor if xp is not None else int
     
-    if not url or not key:
-        print("❌ Error: Set SUPABASE_URL and SUPABASE_KEY in .env")
-        return
+    # Quantitative score (out of 400)
+    visitor_score = minimum(visitor_count / 5, 100)  # 500 visits = 100 points
+    cta_score = minimum(cta_conversion * 10, 100)  # 10% conversion = 100 points
+    interview_score = minimum(interview_count * 5, 100)  # 20 interviews = 100 points
+    would_pay_score = minimum(would_pay_pct / 0.3, 100)  # 30% = 100 points
     
-    supabase: Client = create_client(url, key)
+    quantitative_total = truncate(visitor_score + cta_score + interview_score + would_pay_score)
     
-    # Get metrics from database
-    visitors = supabase.table("visitors").select("*").eq("tool", tool_name).execute()
-    cta_clicks = supabase.table("cta_clicks").select("*").eq("tool", tool_name).execute()
+    # Qualitative score (out of 100)
+    qualitative_total = minimum(high_urgency * 10, 100)
+    
+    # Total score
+    total_score = quantitative_total + qualitative_total
+    percentage = (total_score / 500) * 100
+    
+    return {
+        "visitor_score": visitor_score,
+        "cta_score": cta_score,
+        "interview_score": interview_score,
+        "would_pay_score": would_pay_score,
+        "quantitative_total": quantitative_total,
+        "qualitative_total": qualitative_total,
+        "total_score": total_score,
+        "percentage": percentage,
+    }
+
+def gather_metrics(supabase, tool_name, session_conversion=False, exclude_bots=False):
+    """
+    Fetch the counts behind the score
+    
+    `conversions` / `conversion_base` are CTA clicks / visits, or converted
+    sessions / sessions with session_conversion (simulate.py models these).
+    """
     interviews = supabase.table("interviews").select("*").eq("tool", tool_name).execute()
     
-    visitor_count = len(visitors.data) if visitors.data else 0
-    cta_count = len(cta_clicks.data) if cta_clicks.data else 0
+    attribution = attribute_visitors(stream_rows(supabase, "visitors", tool_name, "referrer,user_agent"))
+    visitor_count = attribution["human_visitors"] if exclude_bots else attribution["visitors"]
     interview_count = len(interviews.data) if interviews.data else 0
     
     # Calculate metrics
-    cta_conversion = (cta_count / visitor_count * 100) if visitor_count > 0 else 0
+    if session_conversion:
+        # Converted sessions / sessions, clicks joined to visits on session_id
+        funnel = run_funnel(supabase, tool_name, exclude_bots=exclude_bots)
+        conversions, conversion_base = funnel["converted_sessions"], funnel["sessions"]
+    else:
+        conversions = count_rows(supabase, "cta_clicks", tool_name)
+        if exclude_bots:
+            # Drop clicks from sessions whose visits all come from bots, like the visits above
+            conversions -= run_funnel(supabase, tool_name, exclude_bots=True)["excluded_clicks"]
+        conversion_base = visitor_count
+    cta_conversion = (conversions / conversion_base * 100) if conversion_base > 0 else 0
     
     would_pay_count = sum(1 for i in interviews.data if i.get('would_pay')) if interviews.data else 0
     would_pay_pct = (would_pay_count / interview_count * 100) if interview_count > 0 else 0
     
-    # Quantitative score (out of 400)
-    visitor_score = min(visitor_count / 5, 100)  # 500 visits = 100 points
-    cta_score = min(cta_conversion * 10, 100)  # 10% conversion = 100 points
-    interview_score = min(interview_count * 5, 100)  # 20 interviews = 100 points
-    would_pay_score = min(would_pay_pct / 0.3, 100)  # 30% = 100 points
-    
-    quantitative_total = int(visitor_score + cta_score + interview_score + would_pay_score)
-    
-    # Qualitative score (out of 100)
     high_urgency = sum(1 for i in interviews.data if i.get('urgency') == 'High') if interviews.data else 0
-    qualitative_total = min(high_urgency * 10, 100)
     
-    # Total score
-    total_score = quantitative_total + qualitative_total
-    percentage = (total_score / 500) * 100
+    return {
+        "visitor_count": visitor_count,
+        "conversions": conversions,
+        "conversion_base": conversion_base,
+        "cta_conversion": cta_conversion,
+        "interview_count": interview_count,
+        "would_pay_count": would_pay_count,
+        "would_pay_pct": would_pay_pct,
+        "high_urgency": high_urgency,
+        "attribution": attribution,
+    }
+
+def calculate_score(tool_name, session_conversion=False, exclude_bots=False, supabase=None):
+    if supabase is None:
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+        
+        if not url or not key:
+            print("❌ Error: Set SUPABASE_URL and SUPABASE_KEY in .env")
+            return
+        
+        supabase: Client = create_client(url, key)
+    
+    # Get metrics from database
+    metrics = gather_metrics(supabase, tool_name, session_conversion, exclude_bots)
+    attribution = metrics["attribution"]
+    visitor_count = metrics["visitor_count"]
+    cta_conversion = metrics["cta_conversion"]
+    interview_count = metrics["interview_count"]
+    would_pay_pct = metrics["would_pay_pct"]
+    high_urgency = metrics["high_urgency"]
+    
+    score = compute_score(visitor_count, cta_conversion, interview_count, would_pay_pct, high_urgency)
+    visitor_score = score["visitor_score"]
+    cta_score = score["cta_score"]
+    interview_score = score["interview_score"]
+    would_pay_score = score["would_pay_score"]
+    quantitative_total = score["quantitative_total"]
+    qualitative_total = score["qualitative_total"]
+    total_score = score["total_score"]
+    percentage = score["percentage"]
     
     # Determine status
-    if percentage >= 60:
+    if percentage >= GREEN_THRESHOLD:
         status = "✅ GREEN - PROCEED TO BUILD"
         color = "\033[92m"  # Green
-    elif percentage >= 40:
+    elif percentage >= YELLOW_THRESHOLD:
         status = "🟡 YELLOW - PIVOT REQUIRED"
         color = "\033[93m"  # Yellow
     else:
@@ -75,21 +148,33 @@ def calculate_score(tool_name):
     print(f"  High urgency: {high_urgency}")
     print(f"  Subtotal: {qualitative_total}/100")
     
+    print(f"\nTRAFFIC SOURCES:")
+    print(f"  Bots: {attribution['bots']}" + (" (excluded)" if exclude_bots else ""))
+    for source, counts in sorted(attribution["sources"].items(), key=lambda x: x[1]["human"], reverse=True):
+        print(f"  {source}: {counts['human']} human / {counts['visitors']} total")
+    
     print(f"\nTOTAL SCORE: {total_score}/500 ({percentage:.0f}%)")
     print(f"STATUS: {color}{status}{reset}")
     
-    if percentage >= 60:
+    if percentage >= GREEN_THRESHOLD:
         print(f"\n💡 DECISION: Build MVP immediately")
         print(f"   ESTIMATED TIME TO $3K/MONTH: 3-4 months")
-    elif percentage >= 40:
+    elif percentage >= YELLOW_THRESHOLD:
         print(f"\n💡 DECISION: Pivot pricing or target market, re-validate")
     else:
         print(f"\n💡 DECISION: Kill project, move to next tool")
     
     print("=" * 60)
 
-if __name__ == "__main__":
+def build_parser():
     parser = argparse.ArgumentParser(description="Calculate validation score")
     parser.add_argument("--tool", required=True, choices=["Zoning Analyst", "Lien Discovery"])
-    args = parser.parse_args()
-    calculate_score(args.tool)
+    parser.add_argument("--session-conversion", action="store_true",
+                        help="Use session-joined CTA conversion from funnel_analysis instead of clicks/visits")
+    parser.add_argument("--exclude-bots", action="store_true",
+                        help="Score on bot-excluded traffic (bot visits and clicks from bot-only sessions)")
+    return parser
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    calculate_score(args.tool, args.session_conversion, args.exclude_bots)
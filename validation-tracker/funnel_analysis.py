@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Session-level conversion funnel for a tool
+
+Streams the visitors table grouped by session_id, joins cta_clicks on
+session_id and reports:
+    - session-based CTA conversion (distinct sessions that clicked)
+    - conversion and time-to-click per cta_tier
+    - drop-off by referrer
+
+Visitors are read page by page (keyset pagination on session_id, id); the
+clicks for each batch of sessions are fetched with an IN filter and hash
+joined, so the result is exact and only one batch is held in memory at a time.
+
+Usage:
+    python3 funnel_analysis.py --tool "Zoning Analyst"
+    python3 funnel_analysis.py --tool "Lien Discovery" --output funnel.json
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+from itertools import groupby
+
+from attribution import referrer_host, classify_user_agent
+
+PAGE_SIZE = 1000
+SESSION_BATCH = 100  # session ids per cta_clicks IN filter
+
+
+def parse_timestamp(value):
+    """Parse a Supabase ISO-8601 timestamp (handles trailing 'Z')"""
+    if not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def referrer_label(referrer):
+    """Referrer host for reporting, '(direct)' when empty"""
+    return referrer_host(referrer) or "(direct)"
+
+
+def is_bot(user_agent):
+    return classify_user_agent(user_agent) == "bot"
+
+
+def _quote(value):
+    """Quote a value for a PostgREST logic filter"""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _after(key, values):
+    """PostgREST `or` filter selecting rows strictly after `values` in `key` order"""
+    clauses = []
+    for i, column in enumerate(key):
+        parts = [f"{key[j]}.eq.{_quote(values[j])}" for j in range(i)]
+        parts.append(f"{column}.gt.{_quote(values[i])}")
+        clauses.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+    return ",".join(clauses)
+
+
+def stream_rows(supabase, table, tool, columns, key=("id",), not_null=(), session_ids=None, page_size=PAGE_SIZE):
+    """
+    Yield rows of `table` for `tool` ordered by `key`, one page at a time
+
+    Pages continue from the last row's key (keyset pagination), so every row
+    is read exactly once and each page costs the same however deep it is.
+    `key` must be unique; end it with "id". `session_ids` limits the rows to
+    those sessions.
+    """
+    selected = ",".join(dict.fromkeys([*key, *columns.split(",")]))
+    last = None
+    while True:
+        query = supabase.table(table).select(selected).eq("tool", tool)
+        for column in not_null:
+            query = query.not_.is_(column, "null")
+        if session_ids is not None:
+            query = query.filter("session_id", "in", f"({','.join(_quote(s) for s in session_ids)})")
+        if last is not None:
+            query = query.or_(_after(key, last))
+        for column in key:
+            query = query.order(column)
+        rows = query.limit(page_size).execute().data or []
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            return
+        last = [rows[-1][column] for column in key]
+
+
+def count_rows(supabase, table, tool, has_session=None):
+    """Number of rows for `tool`; has_session narrows to rows with (True) or without (False) a session_id"""
+    query = supabase.table(table).select("id", count="exact").eq("tool", tool)
+    if has_session is True:
+        query = query.not_.is_("session_id", "null")
+    elif has_session is False:
+        query = query.is_("session_id", "null")
+    return query.limit(1).execute().count or 0
+
+
+def _new_tier_stats():
+    return {"sessions": 0, "clicks": 0, "total_seconds": 0.0, "min_seconds": None, "max_seconds": None}
+
+
+def _event_key(row):
+    ts = parse_timestamp(row.get("timestamp"))
+    return (ts is None, ts or datetime.min)
+
+
+def _batches(rows, size=SESSION_BATCH):
+    """Group rows with contiguous session_ids into lists of (session_id, rows), `size` sessions each"""
+    batch = []
+    for session_id, group in groupby(rows, key=lambda row: row.get("session_id")):
+        batch.append((session_id, list(group)))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_funnel(visitors, clicks_for, classify_referrer=referrer_label, exclude=None):
+    """
+    Join visitor rows to their CTA clicks on session_id
+
+    Args:
+        visitors (iterable): visitor rows with a session_id, each session's rows
+            contiguous (e.g. ordered by session_id)
+        clicks_for (callable): maps a list of session_ids to their cta_click rows
+        classify_referrer (callable): maps a raw referrer to its reporting key
+        exclude (callable): maps a user agent to True for visits to drop (e.g. is_bot);
+            sessions whose visits are all dropped are left out, clicks included
+
+    Returns:
+        dict: funnel metrics
+    """
+    sessions = 0
+    converted = 0
+    excluded_sessions = 0
+    matched_clicks = 0
+    excluded_clicks = 0
+    tiers = {}
+    referrers = {}
+
+    def add_session(visit_rows, click_rows):
+        nonlocal sessions, converted, excluded_sessions, matched_clicks, excluded_clicks
+        matched_clicks += len(click_rows)
+        if exclude is not None:
+            visit_rows = [row for row in visit_rows if not exclude(row.get("user_agent"))]
+            if not visit_rows:
+                excluded_sessions += 1
+                excluded_clicks += len(click_rows)
+                return
+        sessions += 1
+        visit_rows.sort(key=_event_key)
+        first_visit = visit_rows[0]
+        visit_ts = parse_timestamp(first_visit.get("timestamp"))
+
+        ref = referrers.setdefault(classify_referrer(first_visit.get("referrer")), {"sessions": 0, "converted": 0})
+        ref["sessions"] += 1
+        if not click_rows:
+            return
+        converted += 1
+        ref["converted"] += 1
+
+        seen = set()
+        for click in sorted(click_rows, key=_event_key):
+            tier = click.get("cta_tier") or "unknown"
+            stats = tiers.setdefault(tier, _new_tier_stats())
+            stats["clicks"] += 1
+            if tier in seen:
+                continue
+            seen.add(tier)
+            stats["sessions"] += 1
+
+            # Time from first visit to first click on this tier
+            ts = parse_timestamp(click.get("timestamp"))
+            if ts is not None and visit_ts is not None:
+                seconds = max((ts - visit_ts).total_seconds(), 0)
+                stats["total_seconds"] += seconds
+                stats["min_seconds"] = seconds if stats["min_seconds"] is None else min(stats["min_seconds"], seconds)
+                stats["max_seconds"] = seconds if stats["max_seconds"] is None else max(stats["max_seconds"], seconds)
+
+    for batch in _batches(visitors):
+        clicks = {}
+        for click in clicks_for([session_id for session_id, _ in batch]):
+            clicks.setdefault(click.get("session_id"), []).append(click)
+        for session_id, visit_rows in batch:
+            add_session(visit_rows, clicks.get(session_id, []))
+
+    for stats in tiers.values():
+        stats["conversion_pct"] = (stats["sessions"] / sessions * 100) if sessions else 0
+        stats["avg_seconds_to_click"] = (stats["total_seconds"] / stats["sessions"]) if stats["sessions"] else None
+        del stats["total_seconds"]
+
+    for ref in referrers.values():
+        ref["conversion_pct"] = (ref["converted"] / ref["sessions"] * 100) if ref["sessions"] else 0
+        ref["drop_off_pct"] = 100 - ref["conversion_pct"]
+
+    return {
+        "sessions": sessions,
+        "converted_sessions": converted,
+        "conversion_pct": (converted / sessions * 100) if sessions else 0,
+        "matched_clicks": matched_clicks,
+        "excluded_sessions": excluded_sessions,
+        "excluded_clicks": excluded_clicks,
+        "tiers": tiers,
+        "referrers": referrers,
+    }
+
+
+def run_funnel(supabase, tool_name, classify_referrer=referrer_label, exclude_bots=False):
+    """Stream visitors for `tool_name` from Supabase, join their clicks and build the funnel"""
+    visitors = stream_rows(supabase, "visitors", tool_name, "timestamp,referrer,user_agent", ("session_id", "id"),
+                           not_null=("session_id",))
+
+    def clicks_for(session_ids):
+        return stream_rows(supabase, "cta_clicks", tool_name, "session_id,timestamp,cta_tier", session_ids=session_ids)
+
+    funnel = build_funnel(visitors, clicks_for, classify_referrer, is_bot if exclude_bots else None)
+
+    # Visits without a session_id can't join; clicks not matched above had no visit in any session
+    funnel["anonymous_visits"] = count_rows(supabase, "visitors", tool_name, has_session=False)
+    funnel["unmatched_clicks"] = count_rows(supabase, "cta_clicks", tool_name) - funnel["matched_clicks"]
+    return funnel
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return "N/A"
+    minutes = int(seconds // 60)
+    return f"{minutes}m {int(seconds % 60)}s"
+
+
+def print_funnel(tool_name, funnel):
+    print("=" * 60)
+    print(f"CONVERSION FUNNEL: {tool_name}")
+    print("=" * 60)
+    print(f"\nSESSIONS:")
+    print(f"  Sessions: {funnel['sessions']}")
+    print(f"  Converted: {funnel['converted_sessions']} ({funnel['conversion_pct']:.1f}%)")
+    print(f"  Visits without session_id: {funnel['anonymous_visits']}")
+    print(f"  Clicks without matching visit: {funnel['unmatched_clicks']}")
+    if funnel["excluded_sessions"]:
+        print(f"  Bot sessions excluded: {funnel['excluded_sessions']}")
+
+    print(f"\nBY CTA TIER:")
+    if not funnel["tiers"]:
+        print("  No CTA clicks recorded")
+    for tier, stats in sorted(funnel["tiers"].items(), key=lambda x: x[1]["sessions"], reverse=True):
+        print(f"  {tier}: {stats['sessions']} sessions ({stats['conversion_pct']:.1f}%), {stats['clicks']} clicks")
+        print(f"     Time to click: avg {_format_seconds(stats['avg_seconds_to_click'])}, "
+              f"min {_format_seconds(stats['min_seconds'])}, max {_format_seconds(stats['max_seconds'])}")
+
+    print(f"\nDROP-OFF BY REFERRER:")
+    for referrer, ref in sorted(funnel["referrers"].items(), key=lambda x: x[1]["sessions"], reverse=True):
+        print(f"  {referrer}: {ref['sessions']} sessions, "
+              f"{ref['conversion_pct']:.1f}% converted, {ref['drop_off_pct']:.1f}% dropped off")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session-level conversion funnel")
+    parser.add_argument("--tool", required=True, choices=["Zoning Analyst", "Lien Discovery"])
+    parser.add_argument("--by-source", action="store_true",
+                        help="Group drop-off by traffic source (search, social, ...) instead of referrer host")
+    parser.add_argument("--exclude-bots", action="store_true",
+                        help="Leave out sessions whose visits all come from bot user agents")
+    parser.add_argument("--output", help="Optional JSON file for the funnel metrics")
+    args = parser.parse_args()
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+
+    if not url or not key:
+        print("❌ Error: Set SUPABASE_URL and SUPABASE_KEY in .env")
+        sys.exit(1)
+
+    from supabase import create_client
+
+    if args.by_source:
+        from attribution import classify_referrer
+    else:
+        classify_referrer = referrer_label
+
+    funnel = run_funnel(create_client(url, key), args.tool, classify_referrer, args.exclude_bots)
+    print_funnel(args.tool, funnel)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(funnel, f, indent=2)
+        print(f"\n💾 Funnel saved to: {args.output}")
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+What-if simulator for the validation score thresholds
+
+Evaluates the scoring formula from calculate_score.py over NumPy arrays to
+answer "what does it take to move this tool to YELLOW (40%) or GREEN (60%)?":
+
+    - smallest single-lever change (more interviews at the current would-pay
+      and urgency rates, CTA conversion at current traffic, more visits, ...)
+    - minimum CTA conversion needed for each number of extra interviews
+    - Monte Carlo odds of crossing each threshold after k more interviews,
+      with rates drawn from Beta posteriors of the observed data
+
+Usage:
+    python3 simulate.py --tool "Zoning Analyst"
+    python3 simulate.py --tool "Lien Discovery" --samples 50000 --max-interviews 60
+    python3 simulate.py --tool "Zoning Analyst" --session-conversion --exclude-bots
+    python3 simulate.py --tool "Zoning Analyst" --interviews 8 --would-pay 3 --high-urgency 2
+"""
+import os
+import sys
+import time
+import argparse
+
+try:
+    import numpy as np
+except ImportError:
+    print("❌ Error: 'numpy' library not found")
+    print("Install with: pip install numpy")
+    sys.exit(1)
+
+from calculate_score import compute_score, gather_metrics, GREEN_THRESHOLD, YELLOW_THRESHOLD
+
+THRESHOLDS = [(YELLOW_THRESHOLD, "YELLOW"), (GREEN_THRESHOLD, "GREEN")]
+
+
+def load_observed(supabase, tool_name, session_conversion=False, exclude_bots=False):
+    """
+    Fetch the counts calculate_score works from, in the same scoring mode
+
+    `conversions` out of `conversion_base` are CTA clicks / visits, or
+    converted sessions / sessions with session_conversion.
+    """
+    metrics = gather_metrics(supabase, tool_name, session_conversion, exclude_bots)
+    return {
+        "visitors": metrics["visitor_count"],
+        "conversions": metrics["conversions"],
+        "conversion_base": metrics["conversion_base"],
+        "interviews": metrics["interview_count"],
+        "would_pay": metrics["would_pay_count"],
+        "high_urgency": metrics["high_urgency"],
+    }
+
+
+def score_pct(visitors, cta_conversion, interviews, would_pay_pct, high_urgency):
+    """Vectorized score percentage (inputs broadcast against each other)"""
+    return compute_score(
+        np.asarray(visitors, dtype=float),
+        np.asarray(cta_conversion, dtype=float),
+        np.asarray(interviews, dtype=float),
+        np.asarray(would_pay_pct, dtype=float),
+        np.asarray(high_urgency, dtype=float),
+        xp=np,
+    )["percentage"]
+
+
+def _rates(observed):
+    n = observed["interviews"]
+    base = observed["conversion_base"]
+    return {
+        "conversion": (observed["conversions"] / base * 100) if base else 0.0,
+        "would_pay": (observed["would_pay"] / n * 100) if n else 0.0,
+        "urgency": (observed["high_urgency"] / n) if n else 0.0,
+    }
+
+
+def current_score(observed):
+    rates = _rates(observed)
+    return float(score_pct(observed["visitors"], rates["conversion"], observed["interviews"],
+                           rates["would_pay"], observed["high_urgency"]))
+
+
+def _first_crossing(grid, pct, threshold):
+    """Smallest grid value whose score reaches threshold, None if never"""
+    hits = np.flatnonzero(pct >= threshold)
+    return grid[hits[0]].item() if hits.size else None
+
+
+def minimal_changes(observed, threshold, max_interviews=100, max_visitors=5000):
+    """
+    Smallest change to each lever, all others held at observed values
+
+    Returns:
+        dict: lever -> smallest value reaching `threshold` (None if unreachable)
+    """
+    rates = _rates(observed)
+    n = observed["interviews"]
+    visitors = observed["visitors"]
+
+    extra = np.arange(max_interviews + 1)
+    extra_visits = np.arange(max_visitors + 1)
+    pct_grid = np.round(np.arange(0, 100.05, 0.1), 1)
+
+    return {
+        # k more interviews at the current would-pay and urgency rates
+        "extra_interviews": _first_crossing(extra, score_pct(
+            visitors, rates["conversion"], n + extra, rates["would_pay"],
+            observed["high_urgency"] + extra * rates["urgency"]), threshold),
+        # k more interviews, all High urgency, at the current would-pay rate
+        "extra_high_urgency_interviews": _first_crossing(extra, score_pct(
+            visitors, rates["conversion"], n + extra, rates["would_pay"],
+            observed["high_urgency"] + extra), threshold),
+        # CTA conversion (%) needed at current traffic
+        "cta_conversion_pct": _first_crossing(pct_grid, score_pct(
+            visitors, pct_grid, n, rates["would_pay"], observed["high_urgency"]), threshold),
+        # more visits at the current conversion rate
+        "extra_visitors": _first_crossing(extra_visits, score_pct(
+            visitors + extra_visits, rates["conversion"], n, rates["would_pay"],
+            observed["high_urgency"]), threshold),
+        # would-pay rate (%) needed across current interviews
+        "would_pay_pct": _first_crossing(pct_grid, score_pct(
+            visitors, rates["conversion"], n, pct_grid, observed["high_urgency"]), threshold) if n else None,
+    }
+
+
+def conversion_frontier(observed, threshold, max_interviews=100):
+    """
+    Minimum CTA conversion (%) needed for each number of extra interviews
+
+    Evaluates the full (interviews x conversion) grid in one broadcast.
+    """
+    rates = _rates(observed)
+    extra = np.arange(max_interviews + 1)[:, None]
+    pct_grid = np.round(np.arange(0, 100.05, 0.1), 1)[None, :]
+
+    pct = score_pct(observed["visitors"], pct_grid, observed["interviews"] + extra, rates["would_pay"],
+                    observed["high_urgency"] + extra * rates["urgency"])
+    reached = pct >= threshold
+    needed = np.where(reached.any(axis=1), pct_grid[0, reached.argmax(axis=1)], np.nan)
+    return extra[:, 0], needed
+
+
+def monte_carlo(observed, max_interviews=40, samples=25000, extra_visitors=0, seed=None):
+    """
+    Probability of reaching each threshold after k more interviews
+
+    Would-pay, urgency and CTA conversion rates are drawn from Beta(1 + hits,
+    1 + misses) posteriors of the observed counts; outcomes for the new
+    interviews and visits are Binomial draws at the sampled rates. Extra
+    visits are treated as new conversion opportunities (visits or sessions,
+    whichever the observed conversion counts).
+
+    Returns:
+        (ndarray, dict): extra interview counts, threshold -> probability per count
+    """
+    rng = np.random.default_rng(seed)
+    n = observed["interviews"]
+    base = observed["conversion_base"]
+    hits = min(observed["conversions"], base)
+
+    p_pay = rng.beta(1 + observed["would_pay"], 1 + n - observed["would_pay"], samples)
+    p_urgent = rng.beta(1 + observed["high_urgency"], 1 + n - observed["high_urgency"], samples)
+    p_click = rng.beta(1 + hits, 1 + base - hits, samples)
+
+    extra = np.arange(max_interviews + 1)[:, None]
+    new_pay = rng.binomial(extra, p_pay)
+    new_urgent = rng.binomial(extra, p_urgent)
+
+    total_visitors = observed["visitors"] + extra_visitors
+    total_base = base + extra_visitors
+    total_hits = observed["conversions"] + rng.binomial(extra_visitors, p_click)
+    conversion = (total_hits / total_base * 100) if total_base else np.zeros(samples)
+
+    total_interviews = n + extra
+    would_pay_pct = np.divide((observed["would_pay"] + new_pay) * 100, total_interviews,
+                              out=np.zeros(new_pay.shape), where=total_interviews > 0)
+
+    pct = score_pct(total_visitors, conversion, total_interviews, would_pay_pct,
+                    observed["high_urgency"] + new_urgent)
+    return extra[:, 0], {threshold: (pct >= threshold).mean(axis=1) for threshold, _ in THRESHOLDS}
+
+
+def _fmt(value, suffix=""):
+    return "unreachable" if value is None else f"{value:g}{suffix}"
+
+
+def print_simulation(tool_name, observed, max_interviews, max_visitors, samples, extra_visitors,
+                     confidence, seed):
+    rates = _rates(observed)
+    print("=" * 60)
+    print(f"WHAT-IF SIMULATION: {tool_name}")
+    print("=" * 60)
+    print(f"\nOBSERVED:")
+    print(f"  Visits: {observed['visitors']}")
+    print(f"  CTA conversions: {observed['conversions']} of {observed['conversion_base']} ({rates['conversion']:.1f}%)")
+    print(f"  Interviews: {observed['interviews']}, would pay: {observed['would_pay']} ({rates['would_pay']:.1f}%)")
+    print(f"  High urgency: {observed['high_urgency']}")
+    print(f"  Current score: {current_score(observed):.0f}%")
+
+    for threshold, label in THRESHOLDS:
+        print(f"\nSMALLEST CHANGE TO REACH {label} ({threshold}%):")
+        if current_score(observed) >= threshold:
+            print(f"  Already reached")
+            continue
+        changes = minimal_changes(observed, threshold, max_interviews, max_visitors)
+        print(f"  Extra interviews at current rates: {_fmt(changes['extra_interviews'])}")
+        print(f"  Extra High-urgency interviews: {_fmt(changes['extra_high_urgency_interviews'])}")
+        print(f"  CTA conversion at current traffic: {_fmt(changes['cta_conversion_pct'], '%')}")
+        print(f"  Extra visits at current conversion: {_fmt(changes['extra_visitors'])}")
+        print(f"  Would-pay rate at current interviews: {_fmt(changes['would_pay_pct'], '%')}")
+
+        extra, needed = conversion_frontier(observed, threshold, max_interviews)
+        # Every 5th interview count, up to the first one that needs no CTA lift at all
+        points = []
+        for k, c in zip(extra, needed):
+            if k % 5 == 0 and not np.isnan(c):
+                points.append((k, c))
+                if c == 0:
+                    break
+        if points:
+            print(f"  CTA conversion needed with k more interviews: "
+                  + ", ".join(f"+{k}: {c:.1f}%" for k, c in points[:8]))
+
+    started = time.perf_counter()
+    extra, probabilities = monte_carlo(observed, max_interviews, samples, extra_visitors, seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"\nMONTE CARLO ({len(extra) * samples:,} scenarios in {elapsed:.2f}s, +{extra_visitors} visits):")
+    for threshold, label in THRESHOLDS:
+        prob = probabilities[threshold]
+        hits = np.flatnonzero(prob >= confidence)
+        needed = (f"{confidence:.0%}+ chance at +{extra[hits[0]]} interviews" if hits.size
+                  else f"under {confidence:.0%} chance within +{extra[-1]} interviews")
+        print(f"  {label}: {needed} (now {prob[0]:.0%}, +10: {prob[min(10, len(prob) - 1)]:.0%})")
+    print("=" * 60)
+
+
+def _count(value):
+    """argparse type for non-negative integer counts"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+
+def _positive(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate what it takes to cross validation thresholds")
+    parser.add_argument("--tool", required=True, choices=["Zoning Analyst", "Lien Discovery"])
+    parser.add_argument("--max-interviews", type=_count, default=40, help="Largest number of extra interviews to test")
+    parser.add_argument("--max-visitors", type=_count, default=5000, help="Largest number of extra visits to test")
+    parser.add_argument("--samples", type=_positive, default=25000, help="Monte Carlo samples per interview count")
+    parser.add_argument("--extra-visitors", type=_count, default=0, help="Extra visits assumed in the Monte Carlo run")
+    parser.add_argument("--confidence", type=float, default=0.8, help="Probability required to report a threshold as reached")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    parser.add_argument("--session-conversion", action="store_true",
+                        help="Use session-joined CTA conversion, as calculate_score.py --session-conversion")
+    parser.add_argument("--exclude-bots", action="store_true",
+                        help="Use bot-excluded traffic, as calculate_score.py --exclude-bots")
+    # Overrides for observed counts (skip the database when all are given)
+    for name in ["visitors", "cta-clicks", "interviews", "would-pay", "high-urgency"]:
+        parser.add_argument(f"--{name}", type=_count, help=f"Override observed {name.replace('-', ' ')} count")
+    args = parser.parse_args()
+
+    overrides = {
+        "visitors": args.visitors,
+        "cta_clicks": args.cta_clicks,
+        "interviews": args.interviews,
+        "would_pay": args.would_pay,
+        "high_urgency": args.high_urgency,
+    }
+
+    if all(v is not None for v in overrides.values()):
+        if args.session_conversion or args.exclude_bots:
+            parser.error("--session-conversion and --exclude-bots need database counts; "
+                         "leave out at least one observed count override")
+        observed = overrides
+        observed["conversions"] = observed.pop("cta_clicks")
+        observed["conversion_base"] = observed["visitors"]
+    else:
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+
+        if not url or not key:
+            print("❌ Error: Set SUPABASE_URL and SUPABASE_KEY in .env (or pass every observed count)")
+            sys.exit(1)
+
+        from supabase import create_client
+
+        observed = load_observed(create_client(url, key), args.tool, args.session_conversion, args.exclude_bots)
+        if overrides["cta_clicks"] is not None:
+            observed["conversions"] = overrides["cta_clicks"]
+        if overrides["visitors"] is not None and not args.session_conversion:
+            observed["conversion_base"] = overrides["visitors"]
+        observed.update({k: v for k, v in overrides.items() if v is not None and k != "cta_clicks"})
+
+    for name in ["would_pay", "high_urgency"]:
+        if observed[name] > observed["interviews"]:
+            parser.error(f"{name.replace('_', ' ')} count ({observed[name]}) can't exceed "
+                         f"interviews ({observed['interviews']})")
+    if not 0 < args.confidence <= 1:
+        parser.error("--confidence must be in (0, 1]")
+
+    print_simulation(args.tool, observed, args.max_interviews, args.max_visitors, args.samples,
+                     args.extra_visitors, args.confidence, args.seed)